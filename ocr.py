@@ -9,19 +9,32 @@ import json
 import sys
 import time
 from pathlib import Path
-from typing import Iterator, Optional, Literal, Dict, Any
+from typing import Callable, Iterator, Optional, Literal, Dict, Any, TextIO
 from enum import Enum
 import argparse
-import io
+import atexit
+import mmap
 import os
-import pickle
+import re
+import tempfile
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from itertools import islice
 from datetime import datetime
-from difflib import SequenceMatcher
+from functools import lru_cache
 
 import httpx
-from PIL import Image
-from pdf2image import convert_from_path
+
+try:
+    import orjson as _json
+except ImportError:
+    _json = json
+
+try:
+    import pybase64 as _base64
+except ImportError:
+    _base64 = base64
 
 try:
     import yaml
@@ -36,6 +49,68 @@ API_ENDPOINT = f"{SERVER_URL}/v1/chat/completions"
 HEALTH_ENDPOINT = f"{SERVER_URL}/health"
 MODEL_NAME = "LightOnOCR-1B-1025"
 
+# 요청마다 동일한 생성 파라미터 (메시지와 stream 여부만 요청별로 채움)
+REQUEST_TEMPLATE = {
+    "model": MODEL_NAME,
+    "temperature": 0.1,
+    "max_tokens": 4096,
+}
+REQUEST_HEADERS = {"Content-Type": "application/json"}
+
+# 모든 요청이 공유하는 HTTP 클라이언트 (keep-alive 연결 재사용)
+# 요청별 타임아웃은 각 호출에서 지정
+HTTP_CLIENT = httpx.Client(
+    timeout=httpx.Timeout(120.0, connect=5.0),
+    limits=httpx.Limits(max_keepalive_connections=8)
+)
+atexit.register(HTTP_CLIENT.close)
+
+# PDF 페이지 OCR 프롬프트
+PDF_PAGE_PROMPT = "Perform OCR on page {page_num} of this document. Extract all visible text accurately while preserving the original structure, formatting, and layout. Include headings, paragraphs, lists, tables, equations, citations, and any other textual content. For figures, diagrams, charts, or images, describe their position (e.g., 'top-left', 'center', 'bottom-right'), their relationship to surrounding text, and provide a brief description of what they depict. Use markdown format with placeholders like '![Figure X: description](position)' for visual elements. Maintain the spatial hierarchy and reading order of the document."
+
+# 지원 이미지 확장자
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".gif", ".tiff")
+
+# 파일 시그니처로 판별하는 이미지 MIME 타입 (판별 실패 시 JPEG으로 간주)
+IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"BM", "image/bmp"),
+    (b"II*\x00", "image/tiff"),
+    (b"MM\x00*", "image/tiff"),
+)
+
+# PDF 페이지 변환 설정
+PDF_DPI = 150
+PDF_RETRY_DPI = 200  # 반복/토큰 초과로 재시도할 때 사용할 해상도
+PDF_JPEG_QUALITY = 85
+
+# 빈 페이지 판정 설정 (작은 흑백 이미지에서 어두운 픽셀 비율로 판단)
+BLANK_PAGE_EDGE = 128
+BLANK_PAGE_LEVEL = 240  # 이 밝기 미만을 내용이 있는 픽셀로 간주
+BLANK_PAGE_RATIO = 0.005
+BLANK_PAGE_TEXT = "*[빈 페이지]*\n"
+
+# TOKEN 모드 쓰기 버퍼 설정 (크기 또는 시간 기준으로 모아서 기록)
+TOKEN_FLUSH_BYTES = 8192
+TOKEN_FLUSH_INTERVAL = 0.1  # 초
+
+# --fsync 사용 시 스트리밍 중 디스크 동기화 최소 간격
+FSYNC_INTERVAL = 1.0  # 초
+
+# 저장 모드별 구분자 패턴
+WORD_DELIMITER_RE = re.compile(r'[ \n\t]')
+SENTENCE_DELIMITER_RE = re.compile(r'[.!?][ \n]|[。；]')
+
+# SSE `data: ` 줄 패턴 (페이로드를 그룹으로 추출)
+SSE_DATA_RE = re.compile(rb'^data: ([^\r\n]+)\r?\n', re.M)
+
+# 화면 출력 flush 주기 (토큰 수 또는 시간 기준)
+STDOUT_FLUSH_TOKENS = 16
+STDOUT_FLUSH_INTERVAL = 0.05  # 초
+
 # 기본 설정 파일 경로
 DEFAULT_CONFIG_FILES = [
     Path("ocr_config.yml"),
@@ -122,6 +197,7 @@ def create_default_config(config_path: Path) -> bool:
             'streaming': True,
             'save_mode': 'token',
             'save_file': True,
+            'fsync': False,
             'quiet': False,
             'show_stats': False
         },
@@ -130,10 +206,13 @@ def create_default_config(config_path: Path) -> bool:
             'max_retries': 2,
             'page_timeout': 120.0,
             'max_page_tokens': 8000,
-            'dpi': 200
+            'concurrency': 1,
+            'dpi': 150,
+            'max_image_edge': None,
+            'skip_blank_pages': False
         },
         'image': {
-            'jpeg_quality': 95,
+            'jpeg_quality': 85,
             'supported_formats': ['.png', '.jpg', '.jpeg', '.bmp', '.gif', '.tiff']
         },
         'advanced': {
@@ -204,6 +283,9 @@ def merge_config_with_args(config: Dict[str, Any], args: argparse.Namespace) ->
         if not args.no_save:
             args.no_save = not ocr.get('save_file', True)
 
+        if not args.fsync:
+            args.fsync = ocr.get('fsync', False)
+
     # PDF 설정
     if 'pdf' in config:
         pdf = config['pdf']
@@ -219,11 +301,39 @@ def merge_config_with_args(config: Dict[str, Any], args: argparse.Namespace) ->
         if args.max_page_tokens == 8000:  # 기본값인 경우만
             args.max_page_tokens = pdf.get('max_page_tokens', 8000)
 
+        if args.concurrency == 1:  # 기본값인 경우만
+            args.concurrency = pdf.get('concurrency', 1)
+
+        if args.dpi == PDF_DPI:  # 기본값인 경우만
+            args.dpi = pdf.get('dpi', PDF_DPI)
+
+        if args.max_image_edge is None:
+            args.max_image_edge = pdf.get('max_image_edge')
+
+        if not args.skip_blank_pages:
+            args.skip_blank_pages = pdf.get('skip_blank_pages', False)
+
+    # 이미지 설정
+    if 'image' in config:
+        image = config['image']
+        if args.jpeg_quality == PDF_JPEG_QUALITY:  # 기본값인 경우만
+            args.jpeg_quality = image.get('jpeg_quality', PDF_JPEG_QUALITY)
+
     return args
 
 
 class RepetitionDetector:
-    """토큰 반복 패턴 감지기"""
+    """토큰 반복 패턴 감지기
+
+    최근 window_size개 토큰과 그 직전 window_size개 토큰을 문자 SHINGLE_SIZE-gram
+    다중집합으로 보고 Dice 계수(2·|A∩B| / (|A|+|B|))로 유사도를 계산합니다.
+    바이그램은 문자 순서를 거의 반영하지 못해 표/YAML/JSON처럼 같은 문자가 많은
+    정상 페이지에서도 점수가 높게 나오므로, 순서가 반영되는 5-gram을 사용합니다.
+    gram 개수와 교집합 크기는 토큰이 윈도우를 오갈 때마다 증분 갱신하므로
+    토큰당 비용은 토큰 길이에만 비례합니다.
+    """
+
+    SHINGLE_SIZE = 5
 
     def __init__(self,
                  window_size: int = 50,
@@ -238,8 +348,7 @@ class RepetitionDetector:
         self.window_size = window_size
         self.threshold = threshold
         self.max_normal_reps = max_normal_reps
-        self.buffer = []
-        self.consecutive_reps = 0
+        self.reset()
 
     def add_token(self, token: str) -> bool:
         """
@@ -248,15 +357,29 @@ class RepetitionDetector:
         Returns:
             True if repetition detected (should stop)
         """
-        self.buffer.append(token)
+        # 토큰 경계에 걸친 gram도 포함하도록 직전 문자들을 앞에 붙임
+        k = self.SHINGLE_SIZE
+        text = self._tail + token
+        grams = [text[i:i + k] for i in range(len(text) - k + 1)]
+        self._tail = text[-(k - 1):]
+
+        self.recent.append(grams)
+        self._recent_size += self._update(self._recent_counts, self._previous_counts, grams, 1)
+
+        # 최근 윈도우에서 밀려난 토큰은 이전 윈도우로 이동
+        if len(self.recent) > self.window_size:
+            moved = self.recent.popleft()
+            self._recent_size -= self._update(self._recent_counts, self._previous_counts, moved, -1)
+            self.previous.append(moved)
+            self._previous_size += self._update(self._previous_counts, self._recent_counts, moved, 1)
+
+            if len(self.previous) > self.window_size:
+                dropped = self.previous.popleft()
+                self._previous_size -= self._update(self._previous_counts, self._recent_counts, dropped, -1)
 
         # 버퍼가 충분히 차면 분석
-        if len(self.buffer) >= self.window_size * 2:
-            recent = ''.join(self.buffer[-self.window_size:])
-            previous = ''.join(self.buffer[-self.window_size*2:-self.window_size])
-
-            # 유사도 계산
-            similarity = self._calculate_similarity(recent, previous)
+        if len(self.previous) >= self.window_size:
+            similarity = self._calculate_similarity()
 
             if similarity > self.threshold:
                 self.consecutive_reps += 1
@@ -268,22 +391,40 @@ class RepetitionDetector:
                 # 반복이 끊기면 카운터 리셋
                 self.consecutive_reps = 0
 
-            # 버퍼 크기 제한 (메모리 관리)
-            if len(self.buffer) > self.window_size * 3:
-                self.buffer = self.buffer[-self.window_size*2:]
-
         return False
 
-    def _calculate_similarity(self, s1: str, s2: str) -> float:
-        """두 문자열의 유사도 계산"""
-        if s1 == s2:
-            return 1.0
-        # SequenceMatcher를 사용한 유사도 계산
-        return SequenceMatcher(None, s1, s2).ratio()
+    def _update(self, own: Counter, other: Counter, grams: list[str], sign: int) -> int:
+        """own 윈도우에 gram을 추가(sign=1) 또는 제거(sign=-1)하고 교집합 크기를 갱신합니다."""
+        for g in grams:
+            if sign > 0:
+                if own[g] < other[g]:
+                    self._overlap += 1
+                own[g] += 1
+            else:
+                if own[g] <= other[g]:
+                    self._overlap -= 1
+                own[g] -= 1
+                if not own[g]:
+                    del own[g]
+        return len(grams)
+
+    def _calculate_similarity(self) -> float:
+        """두 윈도우의 gram Dice 계수 계산"""
+        total = self._recent_size + self._previous_size
+        if total == 0:
+            return 0.0
+        return 2 * self._overlap / total
 
     def reset(self):
         """버퍼와 카운터 리셋"""
-        self.buffer = []
+        self.recent: deque[list[str]] = deque()
+        self.previous: deque[list[str]] = deque()
+        self._recent_counts: Counter = Counter()
+        self._previous_counts: Counter = Counter()
+        self._recent_size = 0
+        self._previous_size = 0
+        self._overlap = 0
+        self._tail = ""
         self.consecutive_reps = 0
 
 
@@ -295,13 +436,25 @@ class PDFProgress:
     completed_pages: set[int] = field(default_factory=set)
     failed_pages: dict[int, str] = field(default_factory=dict)  # {페이지번호: 에러메시지}
     skipped_pages: set[int] = field(default_factory=set)
+    output_offset: int = 0  # 마지막으로 끝난 페이지까지 기록된 결과 파일 크기 (바이트)
     last_update: datetime = field(default_factory=datetime.now)
 
     def save(self, progress_file: Path):
-        """진행 상황 저장"""
+        """진행 상황 저장 (임시 파일에 쓴 뒤 교체하여 중단되어도 파일이 깨지지 않음)"""
+        data = {
+            "pdf_path": self.pdf_path,
+            "total_pages": self.total_pages,
+            "completed_pages": sorted(self.completed_pages),
+            "failed_pages": {str(page): msg for page, msg in self.failed_pages.items()},
+            "skipped_pages": sorted(self.skipped_pages),
+            "output_offset": self.output_offset,
+            "last_update": self.last_update.isoformat(),
+        }
+        tmp_file = progress_file.with_name(progress_file.name + ".tmp")
         try:
-            with open(progress_file, 'wb') as f:
-                pickle.dump(self, f)
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_file, progress_file)
         except Exception as e:
             print(f"⚠️ 진행 상황 저장 실패: {e}")
 
@@ -311,8 +464,17 @@ class PDFProgress:
         if not progress_file.exists():
             return None
         try:
-            with open(progress_file, 'rb') as f:
-                return pickle.load(f)
+            with open(progress_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return cls(
+                pdf_path=data["pdf_path"],
+                total_pages=data["total_pages"],
+                completed_pages=set(data["completed_pages"]),
+                failed_pages={int(page): msg for page, msg in data["failed_pages"].items()},
+                skipped_pages=set(data["skipped_pages"]),
+                output_offset=data.get("output_offset", 0),
+                last_update=datetime.fromisoformat(data["last_update"]),
+            )
         except Exception as e:
             print(f"⚠️ 진행 상황 로드 실패: {e}")
             return None
@@ -331,7 +493,7 @@ class PDFProgress:
 def check_server_health() -> bool:
     """서버 상태를 확인합니다."""
     try:
-        response = httpx.get(HEALTH_ENDPOINT, timeout=5)
+        response = HTTP_CLIENT.get(HEALTH_ENDPOINT, timeout=5)
         if response.status_code == 200:
             print("서버가 정상적으로 실행 중입니다")
             return True
@@ -343,54 +505,177 @@ def check_server_health() -> bool:
     return False
 
 
-def image_to_base64(image_path: Path) -> str:
-    """이미지 파일을 base64 문자열로 변환합니다."""
+def image_to_base64(image_path: Path) -> bytes:
+    """이미지 파일을 base64 바이트로 변환합니다 (요청 본문에 그대로 이어 붙임)."""
+    if os.path.getsize(image_path) == 0:
+        return b""
+    # mmap으로 읽어 파일 전체를 별도 bytes로 복사하지 않음
+    with open(image_path, "rb") as image_file:
+        with mmap.mmap(image_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return _base64.b64encode(mapped)
+
+
+def detect_image_mime(image_path: Path) -> str:
+    """파일 앞부분의 시그니처로 이미지 MIME 타입을 판별합니다."""
     with open(image_path, "rb") as image_file:
-        return base64.b64encode(image_file.read()).decode("utf-8")
+        header = image_file.read(8)
+    for signature, mime_type in IMAGE_SIGNATURES:
+        if header.startswith(signature):
+            return mime_type
+    return "image/jpeg"
+
 
+def get_pdf_page_count(pdf_path: Path) -> int:
+    """pdfinfo로 PDF 페이지 수를 확인합니다 (페이지를 렌더링하지 않음)."""
+    # 이미지 파일만 처리할 때 시작 시간을 줄이기 위해 필요할 때 import
+    from pdf2image import pdfinfo_from_path
 
-def pdf_to_images(pdf_path: Path) -> list[Image.Image]:
-    """PDF 파일을 이미지 리스트로 변환합니다."""
     try:
-        images = convert_from_path(pdf_path, dpi=200)
-        print(f"📄 PDF를 {len(images)}개의 이미지로 변환했습니다")
-        return images
+        total_pages = int(pdfinfo_from_path(pdf_path)["Pages"])
+        print(f"📄 PDF 페이지 수: {total_pages}")
+        return total_pages
     except Exception as e:
-        print(f"PDF 변환 실패: {e}")
-        return []
-
-
-def should_save_buffer(buffer: str, mode: SaveMode) -> bool:
-    """버퍼를 저장해야 하는지 결정합니다."""
-    if mode == SaveMode.TOKEN:
-        return True  # 항상 즉시 저장
-    elif mode == SaveMode.WORD:
-        return ' ' in buffer or '\n' in buffer or '\t' in buffer
-    elif mode == SaveMode.SENTENCE:
-        return any(p in buffer for p in ['. ', '.\n', '! ', '!\n', '? ', '?\n', '。', '；'])
-    elif mode == SaveMode.PARAGRAPH:
-        return '\n\n' in buffer or buffer.count('\n') >= 2
-    elif mode == SaveMode.LINE:
-        return '\n' in buffer
-    return False
+        print(f"PDF 정보 확인 실패: {e}")
+        return 0
 
 
-def perform_ocr(
-    image_base64: str,
-    prompt: str = "Perform OCR on this image and extract all visible text accurately. Preserve the original structure, formatting, and layout as much as possible. Include headings, paragraphs, lists, tables, equations, and any other textual content. For figures, diagrams, charts, or images, describe their position (e.g., 'top-left', 'center', 'bottom-right'), their relationship to surrounding text, and provide a brief description of what they depict. Use markdown format with placeholders like '![Figure X: description](position)' for visual elements. Maintain the spatial hierarchy and reading order of the document.",
-    output_file: Optional[Path] = None,
-    stream: bool = True,
-    save_mode: SaveMode = SaveMode.TOKEN,
-    quiet: bool = False,
-    show_stats: bool = False,
-    page_timeout: Optional[float] = None,
-    max_page_tokens: Optional[int] = None
-) -> str:
-    """이미지에서 텍스트를 추출합니다."""
+def render_pdf_page(
+    pdf_path: Path,
+    page_num: int,
+    output_folder: Path,
+    dpi: int = PDF_DPI,
+    max_edge: Optional[int] = None,
+    jpeg_quality: int = PDF_JPEG_QUALITY
+) -> Path:
+    """PDF의 한 페이지를 JPEG 파일로 변환하고 경로를 반환합니다.
+
+    pdftoppm이 JPEG을 직접 기록하므로 페이지 이미지를 메모리에 올리지 않습니다.
+    업로드 크기를 줄이기 위해 progressive/optimize 허프만 테이블로 인코딩합니다.
+    max_edge가 주어지면 DPI 대신 긴 변이 max_edge 픽셀이 되도록 변환합니다.
+    """
+    from pdf2image import convert_from_path
+
+    page_paths = convert_from_path(
+        pdf_path,
+        dpi=dpi,
+        fmt="jpeg",
+        jpegopt={"quality": jpeg_quality, "progressive": True, "optimize": True},
+        output_folder=output_folder,
+        first_page=page_num,
+        last_page=page_num,
+        size=max_edge,
+        paths_only=True
+    )
+    return Path(page_paths[0])
+
+
+def is_blank_page(pdf_path: Path, page_num: int) -> bool:
+    """페이지를 작은 흑백 이미지로 변환해 거의 비어 있는지 확인합니다.
+
+    변환에 실패하면 OCR을 건너뛰지 않도록 False를 반환합니다.
+    """
+    from pdf2image import convert_from_path
+
+    try:
+        image = convert_from_path(
+            pdf_path,
+            grayscale=True,
+            size=BLANK_PAGE_EDGE,
+            first_page=page_num,
+            last_page=page_num
+        )[0]
+    except Exception:
+        return False
+
+    with image:
+        histogram = image.histogram()
+        dark_pixels = sum(histogram[:BLANK_PAGE_LEVEL])
+        return dark_pixels < BLANK_PAGE_RATIO * image.width * image.height
+
 
-    # 요청 데이터 구성
+def iter_rendered_pages(
+    pdf_path: Path,
+    page_numbers: list[int],
+    output_folder: Path,
+    dpi: int = PDF_DPI,
+    max_edge: Optional[int] = None,
+    jpeg_quality: int = PDF_JPEG_QUALITY,
+    skip_blank: bool = False,
+    prefetch: int = 2
+) -> Iterator[tuple[int, Optional[Path], bool]]:
+    """다음 페이지들을 미리 병렬로 변환하면서 (페이지 번호, JPEG 경로, 빈 페이지 여부)를 순서대로 반환합니다.
+
+    현재 페이지를 OCR하는 동안 최대 prefetch개 페이지가 동시에 변환됩니다.
+    skip_blank가 True이면 빈 페이지 판정도 미리 수행하고, 빈 페이지는 변환하지 않습니다.
+    변환에 실패했거나 빈 페이지이면 경로 대신 None을 반환합니다.
+    """
+    def prepare(page_num: int) -> tuple[Optional[Path], bool]:
+        if skip_blank and is_blank_page(pdf_path, page_num):
+            return None, True
+        return render_pdf_page(pdf_path, page_num, output_folder, dpi, max_edge, jpeg_quality), False
+
+    remaining = iter(page_numbers)
+    with ThreadPoolExecutor(max_workers=prefetch) as executor:
+        futures = deque(
+            (page_num, executor.submit(prepare, page_num))
+            for page_num in islice(remaining, prefetch)
+        )
+        while futures:
+            page_num, future = futures.popleft()
+            # 하나를 꺼낼 때마다 다음 페이지 변환을 예약하여 선행 변환 개수를 유지
+            for next_page in islice(remaining, 1):
+                futures.append((next_page, executor.submit(prepare, next_page)))
+            try:
+                page_path, blank = future.result()
+            except Exception:
+                page_path, blank = None, False
+            yield page_num, page_path, blank
+
+
+def make_flush_check(mode: SaveMode) -> Callable[[str, int], bool]:
+    """저장 모드에 맞는 버퍼 저장 판단 함수를 반환합니다 (스트리밍 시작 시 한 번만 호출).
+
+    반환된 함수는 (content, newline_count)를 받습니다.
+        content: 새로 추가된 텍스트 (구분자가 토큰 경계에 걸치지 않도록 직전 문자 포함)
+        newline_count: 현재 버퍼에 누적된 줄바꿈 개수
+    """
+    if mode is SaveMode.WORD:
+        search = WORD_DELIMITER_RE.search
+        return lambda content, newline_count: search(content) is not None
+    elif mode is SaveMode.SENTENCE:
+        search = SENTENCE_DELIMITER_RE.search
+        return lambda content, newline_count: search(content) is not None
+    elif mode is SaveMode.PARAGRAPH:
+        # 버퍼 전체의 줄바꿈 개수로 판단하므로 content를 다시 스캔할 필요 없음
+        return lambda content, newline_count: newline_count >= 2
+    elif mode is SaveMode.LINE:
+        return lambda content, newline_count: '\n' in content
+    return lambda content, newline_count: True  # TOKEN: 항상 즉시 저장
+
+
+def iter_sse_data(response: httpx.Response) -> Iterator[bytes]:
+    """SSE 응답에서 `data: ` 페이로드를 디코딩 없이 바이트로 추출합니다."""
+    buf = bytearray()
+    for chunk in response.iter_bytes():
+        buf.extend(chunk)
+        # 완성된 줄까지만 한 번의 정규식 스캔으로 페이로드 추출 (빈 줄, 주석은 자동으로 제외)
+        end = buf.rfind(b'\n') + 1
+        if not end:
+            continue
+        payloads = [m.group(1) for m in SSE_DATA_RE.finditer(buf, 0, end)]
+        del buf[:end]
+        yield from payloads
+
+
+@lru_cache(maxsize=32)
+def build_request_body(prompt: str, stream: bool, mime_type: str = "image/jpeg") -> tuple[bytes, bytes]:
+    """이미지 base64를 제외한 요청 JSON을 직렬화해 (앞부분, 뒷부분)으로 반환합니다.
+
+    base64 문자열은 JSON 이스케이프가 필요 없으므로 두 조각 사이에 그대로 이어 붙입니다.
+    """
+    placeholder = "__IMAGE_BASE64__"
     request_data = {
-        "model": MODEL_NAME,
+        **REQUEST_TEMPLATE,
         "messages": [
             {
                 "role": "user",
@@ -399,16 +684,45 @@ def perform_ocr(
                     {
                         "type": "image_url",
                         "image_url": {
-                            "url": f"data:image/jpeg;base64,{image_base64}"
+                            "url": f"data:{mime_type};base64,{placeholder}"
                         }
                     }
                 ]
             }
         ],
-        "temperature": 0.1,
-        "max_tokens": 4096,
         "stream": stream
     }
+    body = json.dumps(request_data, ensure_ascii=False).encode("utf-8")
+    # 이미지 URL은 프롬프트 뒤에 오므로 마지막 자리표시자를 기준으로 나눔
+    prefix, _, suffix = body.rpartition(placeholder.encode("ascii"))
+    return prefix, suffix
+
+
+def perform_ocr(
+    image_base64: bytes,
+    prompt: str = "Perform OCR on this image and extract all visible text accurately. Preserve the original structure, formatting, and layout as much as possible. Include headings, paragraphs, lists, tables, equations, and any other textual content. For figures, diagrams, charts, or images, describe their position (e.g., 'top-left', 'center', 'bottom-right'), their relationship to surrounding text, and provide a brief description of what they depict. Use markdown format with placeholders like '![Figure X: description](position)' for visual elements. Maintain the spatial hierarchy and reading order of the document.",
+    file_handle: Optional[TextIO] = None,
+    stream: bool = True,
+    save_mode: SaveMode = SaveMode.TOKEN,
+    quiet: bool = False,
+    show_stats: bool = False,
+    page_timeout: Optional[float] = None,
+    max_page_tokens: Optional[int] = None,
+    fsync: bool = False,
+    mime_type: str = "image/jpeg"
+) -> str:
+    """이미지에서 텍스트를 추출합니다.
+
+    file_handle이 주어지면 결과를 해당 파일에 이어서 기록합니다.
+    파일을 열고 닫는 것은 호출하는 쪽의 책임입니다.
+    mime_type은 data URL에 표시할 이미지 형식입니다.
+    fsync가 True이면 스트리밍 중에는 최대 FSYNC_INTERVAL마다,
+    스트림 종료 시(비스트리밍은 결과 기록 후)에는 한 번 디스크 동기화를 수행합니다.
+    """
+
+    # 요청 본문 구성 (프롬프트 부분은 캐시된 직렬화 결과를 재사용)
+    body_prefix, body_suffix = build_request_body(prompt, stream, mime_type)
+    request_body = b"".join((body_prefix, image_base64, body_suffix))
 
     # 통계 변수
     stats = {
@@ -421,20 +735,21 @@ def perform_ocr(
     if not stream:
         # 비스트리밍 모드
         try:
-            response = httpx.post(API_ENDPOINT, json=request_data, timeout=60)
+            response = HTTP_CLIENT.post(API_ENDPOINT, content=request_body, headers=REQUEST_HEADERS, timeout=60)
             if response.status_code == 200:
-                result = response.json()
-                if "choices" in result and len(result["choices"]) > 0:
-                    text = result["choices"][0]["message"]["content"]
+                # 응답 형식이 다르면 KeyError 등이 발생하여 아래에서 APIError로 변환됨
+                text = _json.loads(response.content)["choices"][0]["message"]["content"]
 
-                    if not quiet:
-                        print(text)
+                if not quiet:
+                    print(text)
 
-                    if output_file:
-                        with open(output_file, "a", encoding="utf-8") as f:
-                            f.write(text)
+                if file_handle:
+                    file_handle.write(text)
+                    if fsync:
+                        file_handle.flush()
+                        os.fsync(file_handle.fileno())
 
-                    return text
+                return text
             else:
                 if not quiet:
                     print(f"API 오류: {response.status_code}")
@@ -446,95 +761,129 @@ def perform_ocr(
             raise APIError(f"OCR processing error: {e}")
 
     # 스트리밍 모드
-    file_handle = None
-    if output_file:
-        # Python 3에서는 텍스트 모드에서 unbuffered(0)를 사용할 수 없음
-        # 최소 line buffered(1) 사용하고, TOKEN 모드에서는 flush()와 fsync()로 즉시 저장
-        file_handle = open(output_file, "a", encoding="utf-8", buffering=1)
+    if file_handle:
+        # 스트리밍 결과는 file_handle.buffer에 바이트로 직접 기록하므로
+        # 호출 측이 텍스트 계층에 써 둔 내용(헤더 등)을 먼저 내보냄
+        file_handle.flush()
+
+    # 저장 모드 분기는 루프 밖에서 한 번만 판별
+    token_mode = save_mode is SaveMode.TOKEN
+    flush_check = make_flush_check(save_mode)
+
+    # TOKEN 모드 쓰기 대기 버퍼 (UTF-8로 인코딩한 바이트 수 기준으로 flush)
+    pending: list[bytes] = []
+    pending_bytes = 0
+    last_flush = time.monotonic()
+    last_fsync = last_flush
+
+    # 화면 출력은 매 토큰 flush하지 않고 일정 토큰 또는 시간마다 모아서 flush
+    stdout_write = sys.stdout.write
+    tokens_since_flush = 0
+    last_stdout_flush = last_flush
 
     # 반복 감지기 초기화
     repetition_detector = RepetitionDetector()
 
-    total_text = ""
+    chunks: list[str] = []
     try:
-        buffer = ""
+        buffer: list[str] = []
+        newline_count = 0
         # 타임아웃 설정 (기본값: 120초, 페이지 타임아웃이 있으면 그것 사용)
         timeout = page_timeout if page_timeout else 120
-        with httpx.Client(timeout=timeout) as client:
-            with client.stream("POST", API_ENDPOINT, json=request_data) as response:
-                if response.status_code != 200:
+        with HTTP_CLIENT.stream(
+            "POST", API_ENDPOINT, content=request_body, headers=REQUEST_HEADERS, timeout=timeout
+        ) as response:
+            if response.status_code != 200:
+                if not quiet:
+                    print(f"API 오류: {response.status_code}")
+                raise APIError(f"API error: {response.status_code}")
+
+            for data in iter_sse_data(response):
+                if data == b"[DONE]":
+                    # 마지막 버퍼 처리
+                    if buffer and file_handle:
+                        file_handle.buffer.write("".join(buffer).encode("utf-8"))
+                        file_handle.flush()
+                        stats["saves"] += 1
+                    break
+
+                try:
+                    content = _json.loads(data)["choices"][0]["delta"]["content"]
+                except (ValueError, KeyError, IndexError, TypeError):
+                    # JSON 오류(json/orjson 모두 ValueError 하위 클래스) 또는 content 없는 청크
+                    continue
+
+                if not content:
+                    continue
+
+                # 타임아웃 체크
+                if page_timeout and (time.time() - stats["start_time"]) > page_timeout:
                     if not quiet:
-                        print(f"API 오류: {response.status_code}")
-                    raise APIError(f"API error: {response.status_code}")
-
-                for line in response.iter_lines():
-                    if line.startswith("data: "):
-                        data = line[6:]
-
-                        if data == "[DONE]":
-                            # 마지막 버퍼 처리
-                            if buffer and file_handle:
-                                file_handle.write(buffer)
-                                file_handle.flush()
-                                stats["saves"] += 1
-                            break
+                        print(f"\n\n⏱️ 페이지 타임아웃 ({page_timeout}초 초과)")
+                    raise PageTimeoutError(f"Page timeout after {page_timeout} seconds")
+
+                # 토큰 수 체크
+                if max_page_tokens and stats["tokens"] >= max_page_tokens:
+                    if not quiet:
+                        print(f"\n\n🛑 최대 토큰 수 도달 ({max_page_tokens})")
+                    raise TokenLimitError(f"Token limit reached: {max_page_tokens}")
+
+                # 반복 감지
+                if repetition_detector.add_token(content):
+                    if not quiet:
+                        print(f"\n\n⚠️ 반복 패턴 감지! ({repetition_detector.consecutive_reps}회 연속 {int(repetition_detector.threshold*100)}% 유사)")
+                    raise RepetitionError(f"Repetition pattern detected after {repetition_detector.consecutive_reps} consecutive repetitions")
+
+                # 첫 토큰 시간 기록
+                if stats["first_token_time"] is None:
+                    stats["first_token_time"] = time.time()
+
+                stats["tokens"] += 1
+                chunks.append(content)
 
-                        try:
-                            json_data = json.loads(data)
-                            if "choices" in json_data and len(json_data["choices"]) > 0:
-                                delta = json_data["choices"][0].get("delta", {})
-                                content = delta.get("content", "")
-
-                                if content:
-                                    # 타임아웃 체크
-                                    if page_timeout and (time.time() - stats["start_time"]) > page_timeout:
-                                        if not quiet:
-                                            print(f"\n\n⏱️ 페이지 타임아웃 ({page_timeout}초 초과)")
-                                        raise PageTimeoutError(f"Page timeout after {page_timeout} seconds")
-
-                                    # 토큰 수 체크
-                                    if max_page_tokens and stats["tokens"] >= max_page_tokens:
-                                        if not quiet:
-                                            print(f"\n\n🛑 최대 토큰 수 도달 ({max_page_tokens})")
-                                        raise TokenLimitError(f"Token limit reached: {max_page_tokens}")
-
-                                    # 반복 감지
-                                    if repetition_detector.add_token(content):
-                                        if not quiet:
-                                            print(f"\n\n⚠️ 반복 패턴 감지! ({repetition_detector.consecutive_reps}회 연속 {int(repetition_detector.threshold*100)}% 유사)")
-                                        raise RepetitionError(f"Repetition pattern detected after {repetition_detector.consecutive_reps} consecutive repetitions")
-
-                                    # 첫 토큰 시간 기록
-                                    if stats["first_token_time"] is None:
-                                        stats["first_token_time"] = time.time()
-
-                                    stats["tokens"] += 1
-                                    total_text += content
-
-                                    # 화면 출력
-                                    if not quiet:
-                                        print(content, end="", flush=True)
-
-                                    # 저장 모드에 따른 처리
-                                    if save_mode == SaveMode.TOKEN:
-                                        # 즉시 저장
-                                        if file_handle:
-                                            file_handle.write(content)
-                                            file_handle.flush()
-                                            os.fsync(file_handle.fileno())
-                                            stats["saves"] += 1
-                                    else:
-                                        # 버퍼에 추가하고 조건 확인
-                                        buffer += content
-                                        if should_save_buffer(buffer, save_mode):
-                                            if file_handle:
-                                                file_handle.write(buffer)
-                                                file_handle.flush()
-                                                stats["saves"] += 1
-                                            buffer = ""
-
-                        except json.JSONDecodeError:
-                            continue
+                # 화면 출력
+                if not quiet:
+                    stdout_write(content)
+                    tokens_since_flush += 1
+                    now = time.monotonic()
+                    if tokens_since_flush >= STDOUT_FLUSH_TOKENS or now - last_stdout_flush > STDOUT_FLUSH_INTERVAL:
+                        sys.stdout.flush()
+                        tokens_since_flush = 0
+                        last_stdout_flush = now
+
+                # 저장 모드에 따른 처리
+                if token_mode:
+                    # 즉시 저장
+                    if file_handle:
+                        encoded = content.encode("utf-8")
+                        pending.append(encoded)
+                        pending_bytes += len(encoded)
+                        now = time.monotonic()
+                        if pending_bytes >= TOKEN_FLUSH_BYTES or now - last_flush > TOKEN_FLUSH_INTERVAL:
+                            file_handle.buffer.write(b"".join(pending))
+                            file_handle.flush()
+                            pending.clear()
+                            pending_bytes = 0
+                            last_flush = now
+                            stats["saves"] += 1
+                            if fsync and now - last_fsync >= FSYNC_INTERVAL:
+                                os.fsync(file_handle.fileno())
+                                last_fsync = now
+                else:
+                    # 버퍼에 추가하고 새 content만 검사
+                    scan = buffer[-1][-1] + content if buffer else content
+                    buffer.append(content)
+                    newline_count += content.count('\n')
+                    if flush_check(scan, newline_count):
+                        if file_handle:
+                            file_handle.buffer.write("".join(buffer).encode("utf-8"))
+                            file_handle.flush()
+                            stats["saves"] += 1
+                            if fsync and time.monotonic() - last_fsync >= FSYNC_INTERVAL:
+                                os.fsync(file_handle.fileno())
+                                last_fsync = time.monotonic()
+                        buffer.clear()
+                        newline_count = 0
 
     except (RepetitionError, PageTimeoutError, TokenLimitError, APIError) as e:
         # 우리가 정의한 예외들은 그대로 전파
@@ -550,9 +899,17 @@ def perform_ocr(
             print(f"\nOCR 처리 중 오류: {e}")
         raise APIError(f"Unexpected error: {e}")
     finally:
+        if not quiet:
+            sys.stdout.flush()
+
         if file_handle:
+            if pending:
+                file_handle.buffer.write(b"".join(pending))
+                pending.clear()
+                stats["saves"] += 1
             file_handle.flush()
-            file_handle.close()
+            if fsync:
+                os.fsync(file_handle.fileno())
 
         # 통계 출력
         if show_stats and stats["first_token_time"]:
@@ -567,7 +924,18 @@ def perform_ocr(
             print(f"   전체 시간: {elapsed:.2f}초")
             print(f"   토큰/초: {stats['tokens']/elapsed:.1f}")
 
-    return total_text
+    return "".join(chunks)
+
+
+def get_output_path(input_path: Path, stream: bool, save_mode: SaveMode, keep_suffix: bool = False) -> Path:
+    """결과 마크다운 파일 경로를 반환합니다.
+
+    keep_suffix가 True이면 원본 확장자를 남겨(scan.png.md) 이름이 같은 파일끼리 겹치지 않게 합니다.
+    """
+    base = input_path.with_name(input_path.name + ".md") if keep_suffix else input_path.with_suffix(".md")
+    if stream and save_mode != SaveMode.TOKEN:
+        return base.with_suffix(f".{save_mode.value}.md")
+    return base
 
 
 def process_image_file(
@@ -576,9 +944,11 @@ def process_image_file(
     save_mode: SaveMode = SaveMode.TOKEN,
     quiet: bool = False,
     show_stats: bool = False,
-    no_save: bool = False
-):
-    """이미지 파일을 처리합니다."""
+    no_save: bool = False,
+    fsync: bool = False,
+    keep_suffix: bool = False
+) -> bool:
+    """이미지 파일을 처리합니다. 텍스트 추출에 성공하면 True를 반환합니다."""
     mode_str = f"스트리밍 - {save_mode.value}" if stream else "일반"
     if not quiet:
         print(f"\n🖼️ 이미지 처리 ({mode_str} 모드): {image_path.name}")
@@ -586,21 +956,21 @@ def process_image_file(
 
     if not image_path.exists():
         print(f"파일을 찾을 수 없습니다: {image_path}")
-        return
+        return False
 
     # 출력 파일 경로
     output_path = None
+    out = None
     if not no_save:
-        if stream and save_mode != SaveMode.TOKEN:
-            output_path = image_path.with_suffix(f".{save_mode.value}.md")
-        else:
-            output_path = image_path.with_suffix(".md")
-
-        # 파일 초기화
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(f"# OCR 결과: {image_path.name}\n\n")
-            f.write(f"**처리 방식**: {mode_str}\n\n")
-            f.write("---\n\n")
+        output_path = get_output_path(image_path, stream, save_mode, keep_suffix)
+
+        # 파일 초기화 (처리가 끝날 때까지 한 번만 열어 둠)
+        out = open(output_path, "w", encoding="utf-8")
+        out.write(
+            f"# OCR 결과: {image_path.name}\n\n"
+            f"**처리 방식**: {mode_str}\n\n"
+            "---\n\n"
+        )
 
         if not quiet:
             print(f"📝 결과 파일: {output_path}")
@@ -610,45 +980,49 @@ def process_image_file(
         if stream:
             print("=" * 50)
 
-    # 이미지를 base64로 변환
-    start_time = time.time()
-    image_base64 = image_to_base64(image_path)
-
-    # OCR 수행
     try:
-        extracted_text = perform_ocr(
-            image_base64,
-            output_file=output_path,
-            stream=stream,
-            save_mode=save_mode,
-            quiet=quiet,
-            show_stats=show_stats
-        )
-    except (RepetitionError, PageTimeoutError, TokenLimitError) as e:
-        if not quiet:
-            print(f"\n⚠️ 처리 중단: {e}")
-        # 부분 결과라도 저장
-        if output_path:
-            with open(output_path, "a", encoding="utf-8") as f:
-                f.write(f"\n\n*[처리 중단: {e}]*\n")
-        extracted_text = None
-    except APIError as e:
-        if not quiet:
-            print(f"\nAPI 오류: {e}")
-        if output_path:
-            with open(output_path, "a", encoding="utf-8") as f:
-                f.write(f"\n\n*[API 오류: {e}]*\n")
-        extracted_text = None
+        # 이미지를 base64로 변환
+        start_time = time.time()
+        image_base64 = image_to_base64(image_path)
+        mime_type = detect_image_mime(image_path)
+
+        # OCR 수행
+        try:
+            extracted_text = perform_ocr(
+                image_base64,
+                file_handle=out,
+                stream=stream,
+                save_mode=save_mode,
+                quiet=quiet,
+                show_stats=show_stats,
+                fsync=fsync,
+                mime_type=mime_type
+            )
+        except (RepetitionError, PageTimeoutError, TokenLimitError) as e:
+            if not quiet:
+                print(f"\n⚠️ 처리 중단: {e}")
+            # 부분 결과라도 저장
+            if out:
+                out.write(f"\n\n*[처리 중단: {e}]*\n")
+            extracted_text = None
+        except APIError as e:
+            if not quiet:
+                print(f"\nAPI 오류: {e}")
+            if out:
+                out.write(f"\n\n*[API 오류: {e}]*\n")
+            extracted_text = None
 
-    elapsed_time = time.time() - start_time
+        elapsed_time = time.time() - start_time
 
-    if stream and not quiet:
-        print("\n" + "=" * 50)
+        if stream and not quiet:
+            print("\n" + "=" * 50)
 
-    # 처리 시간 추가
-    if output_path:
-        with open(output_path, "a", encoding="utf-8") as f:
-            f.write(f"\n\n---\n\n**처리 시간**: {elapsed_time:.2f}초\n")
+        # 처리 시간 추가
+        if out:
+            out.write(f"\n\n---\n\n**처리 시간**: {elapsed_time:.2f}초\n")
+    finally:
+        if out:
+            out.close()
 
     if extracted_text:
         if not quiet:
@@ -661,6 +1035,63 @@ def process_image_file(
             if output_path:
                 print(f"💾 부분 결과 저장: {output_path}")
 
+    return bool(extracted_text)
+
+
+def ocr_pdf_page(
+    pdf_path: Path,
+    page_num: int,
+    output_folder: Path,
+    max_retries: int = 2,
+    skip_errors: bool = False,
+    page_timeout: Optional[float] = 120.0,
+    max_page_tokens: Optional[int] = 8000,
+    dpi: int = PDF_DPI,
+    max_edge: Optional[int] = None,
+    jpeg_quality: int = PDF_JPEG_QUALITY,
+    skip_blank: bool = False
+) -> str:
+    """PDF 페이지 하나를 변환한 뒤 OCR합니다 (병렬 처리용).
+
+    화면 출력 없이 스트리밍으로 요청하므로 페이지 타임아웃, 토큰 제한,
+    반복 감지가 순차 처리와 동일하게 적용됩니다.
+    skip_blank가 True이고 빈 페이지이면 OCR 없이 BLANK_PAGE_TEXT를 반환합니다.
+    """
+    if skip_blank and is_blank_page(pdf_path, page_num):
+        return BLANK_PAGE_TEXT
+
+    image_base64 = None
+    for attempt in range(1, max_retries + 1):
+        try:
+            # 변환 실패도 순차 처리와 같이 재시도 대상
+            if image_base64 is None:
+                page_path = render_pdf_page(pdf_path, page_num, output_folder, dpi, max_edge, jpeg_quality)
+                try:
+                    image_base64 = image_to_base64(page_path)
+                finally:
+                    page_path.unlink(missing_ok=True)
+
+            return perform_ocr(
+                image_base64,
+                PDF_PAGE_PROMPT.format(page_num=page_num),
+                quiet=True,
+                page_timeout=page_timeout,
+                max_page_tokens=max_page_tokens
+            )
+        except (RepetitionError, PageTimeoutError, TokenLimitError) as e:
+            # 순차 처리와 동일하게 skip_errors면 재시도하지 않음
+            if skip_errors or attempt >= max_retries:
+                raise
+            # 해상도가 부족해 반복/과다 생성된 경우 더 높은 DPI로 다시 변환
+            if max_edge is None and not isinstance(e, PageTimeoutError) and dpi < PDF_RETRY_DPI:
+                dpi = PDF_RETRY_DPI
+                image_base64 = None
+        except Exception:
+            # API 오류 및 페이지 변환/인코딩 오류
+            if attempt >= max_retries:
+                raise
+    return ""
+
 
 def process_pdf_file(
     pdf_path: Path,
@@ -674,9 +1105,21 @@ def process_pdf_file(
     skip_errors: bool = False,
     max_retries: int = 2,
     page_timeout: Optional[float] = 120.0,
-    max_page_tokens: Optional[int] = 8000
-):
-    """PDF 파일을 처리합니다."""
+    max_page_tokens: Optional[int] = 8000,
+    concurrency: int = 1,
+    fsync: bool = False,
+    dpi: int = PDF_DPI,
+    max_edge: Optional[int] = None,
+    jpeg_quality: int = PDF_JPEG_QUALITY,
+    skip_blank: bool = False,
+    keep_suffix: bool = False
+) -> bool:
+    """PDF 파일을 처리합니다. 모든 페이지가 완료되었거나 건너뛰어졌으면 True를 반환합니다.
+
+    concurrency가 2 이상이면 여러 페이지를 동시에 요청하고
+    결과는 페이지 순서대로 기록합니다 (실시간 화면 출력 없음).
+    skip_blank가 True이면 빈 페이지는 OCR 요청 없이 표시만 남깁니다.
+    """
     mode_str = f"스트리밍 - {save_mode.value}" if stream else "일반"
     if not quiet:
         print(f"\n📄 PDF 처리 ({mode_str} 모드): {pdf_path.name}")
@@ -684,7 +1127,7 @@ def process_pdf_file(
 
     if not pdf_path.exists():
         print(f"파일을 찾을 수 없습니다: {pdf_path}")
-        return
+        return False
 
     # 진행 상황 파일 경로
     progress_file = pdf_path.with_suffix('.progress')
@@ -701,180 +1144,306 @@ def process_pdf_file(
                 print("⚠️ 이전 진행 상황을 찾을 수 없습니다. 처음부터 시작합니다.")
             progress = None
 
-    # PDF를 이미지로 변환
-    images = pdf_to_images(pdf_path)
-    if not images:
-        return
-
-    # 진행 상황 초기화 (필요 시)
-    if progress is None:
-        progress = PDFProgress(
-            pdf_path=str(pdf_path),
-            total_pages=len(images)
-        )
+    # 페이지 이미지는 임시 디렉토리에 저장하고 처리가 끝나면 삭제
+    page_dir = tempfile.TemporaryDirectory(prefix="lightonocr_")
+    out = None
+    rendered = None
+    try:
+        # 페이지 수만 먼저 확인하고, 각 페이지는 처리 직전에 변환
+        total_pages = get_pdf_page_count(pdf_path)
+        if not total_pages:
+            return False
 
-    # 처리할 페이지 결정
-    if start_page:
-        pages_to_process = list(range(start_page, len(images) + 1))
-    else:
-        pages_to_process = progress.get_pending_pages()
-        if not pages_to_process and not quiet:
-            print("모든 페이지가 이미 처리되었습니다.")
-            return
+        # 진행 상황 초기화 (필요 시)
+        if progress is None:
+            progress = PDFProgress(
+                pdf_path=str(pdf_path),
+                total_pages=total_pages
+            )
 
-    # 출력 파일 경로
-    output_path = None
-    if not no_save:
-        if stream and save_mode != SaveMode.TOKEN:
-            output_path = pdf_path.with_suffix(f".{save_mode.value}.md")
+        # 처리할 페이지 결정
+        if start_page:
+            pages_to_process = list(range(start_page, total_pages + 1))
         else:
-            output_path = pdf_path.with_suffix(".md")
-
-        # 파일 초기화
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(f"# OCR 결과: {pdf_path.name}\n\n")
-            f.write(f"**총 페이지 수**: {len(images)}페이지\n")
-            f.write(f"**처리 방식**: {mode_str}\n\n")
-            f.write("---\n\n")
-
-        if not quiet:
-            print(f"📝 결과 파일: {output_path}")
-
-    total_start_time = time.time()
-    success_count = 0
+            pages_to_process = progress.get_pending_pages()
+            if not pages_to_process:
+                if not quiet:
+                    print("모든 페이지가 이미 처리되었습니다.")
+                return True
+
+        # 출력 파일 경로
+        output_path = None
+        if not no_save:
+            output_path = get_output_path(pdf_path, stream, save_mode, keep_suffix)
+
+            # 파일 초기화 (처리가 끝날 때까지 한 번만 열어 둠)
+            if resume and not start_page and progress.output_offset and output_path.exists():
+                # 이어서 처리: 마지막으로 끝난 페이지 뒤의 부분 결과만 잘라내고 이어 씀
+                out = open(output_path, "r+", encoding="utf-8")
+                out.seek(progress.output_offset)
+                out.truncate()
+            else:
+                out = open(output_path, "w", encoding="utf-8")
+                out.write(
+                    f"# OCR 결과: {pdf_path.name}\n\n"
+                    f"**총 페이지 수**: {total_pages}페이지\n"
+                    f"**처리 방식**: {mode_str}\n\n"
+                    "---\n\n"
+                )
 
-    # 각 페이지 처리
-    for page_num in pages_to_process:
-        # 이미 완료된 페이지는 건너뛰기
-        if page_num in progress.completed_pages:
             if not quiet:
-                print(f"\n페이지 {page_num} 이미 완료됨 (건너뜀)")
-            success_count += 1
-            continue
-
-        if not quiet:
-            print(f"\n📖 페이지 {page_num}/{len(images)} 처리 중...")
-            if stream:
-                print("-" * 40)
-
-        # 페이지 이미지 가져오기
-        image = images[page_num - 1]
+                print(f"📝 결과 파일: {output_path}")
 
-        retry_count = 0
-        page_success = False
+        total_start_time = time.time()
+        success_count = 0
 
-        while retry_count < max_retries and not page_success:
-            try:
-                if retry_count > 0 and not quiet:
-                    print(f"🔄 페이지 {page_num} 재시도 ({retry_count}/{max_retries})")
-
-                # PIL Image를 base64로 변환
-                buffer = io.BytesIO()
-                image.save(buffer, format="JPEG", quality=95)
-                image_base64 = base64.b64encode(buffer.getvalue()).decode()
-
-                # 페이지 헤더 추가 (첫 시도일 때만)
-                if output_path and retry_count == 0:
-                    with open(output_path, "a", encoding="utf-8") as f:
-                        f.write(f"## 페이지 {page_num}\n\n")
-
-                # OCR 수행
-                extracted_text = perform_ocr(
-                    image_base64,
-                    f"Perform OCR on page {page_num} of this document. Extract all visible text accurately while preserving the original structure, formatting, and layout. Include headings, paragraphs, lists, tables, equations, citations, and any other textual content. For figures, diagrams, charts, or images, describe their position (e.g., 'top-left', 'center', 'bottom-right'), their relationship to surrounding text, and provide a brief description of what they depict. Use markdown format with placeholders like '![Figure X: description](position)' for visual elements. Maintain the spatial hierarchy and reading order of the document.",
-                    output_file=output_path,
-                    stream=stream,
-                    save_mode=save_mode,
-                    quiet=quiet,
-                    show_stats=False,  # 페이지별 통계는 표시하지 않음
-                    page_timeout=page_timeout,
-                    max_page_tokens=max_page_tokens
+        # 각 페이지 처리
+        if concurrency > 1:
+            pending_pages = [p for p in pages_to_process if p not in progress.completed_pages]
+            success_count += len(pages_to_process) - len(pending_pages)
+            if not quiet:
+                print(f"\n⚡ {len(pending_pages)}개 페이지를 최대 {concurrency}개씩 동시 처리합니다")
+
+            executor = ThreadPoolExecutor(max_workers=concurrency)
+            futures = {
+                page_num: executor.submit(
+                    ocr_pdf_page, pdf_path, page_num, Path(page_dir.name),
+                    max_retries, skip_errors, page_timeout, max_page_tokens, dpi, max_edge,
+                    jpeg_quality, skip_blank
                 )
+                for page_num in pending_pages
+            }
+            try:
+                for page_num in pending_pages:
+                    error_msg = None
+                    processing_error = False
+                    try:
+                        extracted_text = futures[page_num].result()
+                    except (APIError, RepetitionError, PageTimeoutError, TokenLimitError) as e:
+                        extracted_text = None
+                        error_msg = str(e)
+                    except Exception as e:
+                        # 페이지 변환 등 OCR 외 오류 (순차 처리와 같이 skip_errors와 무관하게 기록)
+                        extracted_text = None
+                        error_msg = str(e)
+                        processing_error = True
+
+                    if out:
+                        out.write(f"## 페이지 {page_num}\n\n")
+                        if extracted_text:
+                            out.write(extracted_text)
+                        elif processing_error:
+                            out.write(f"*[처리 오류: {error_msg}]*\n")
+                        elif error_msg and skip_errors:
+                            out.write(f"*[{error_msg}]*\n")
+
+                    if extracted_text:
+                        progress.completed_pages.add(page_num)
+                        success_count += 1
+                        if not quiet:
+                            print(f"\n📖 페이지 {page_num}/{total_pages}")
+                            print("-" * 40)
+                            print(extracted_text)
+                            print(f"\n페이지 {page_num} 완료")
+                    elif error_msg:
+                        progress.failed_pages[page_num] = error_msg
+                        if not quiet:
+                            print(f"\n⚠️ 페이지 {page_num}: {error_msg}")
+                        if not skip_errors:
+                            progress.save(progress_file)
+                            return False
+                        progress.skipped_pages.add(page_num)
+                        if not quiet:
+                            print(f"⏭️ 페이지 {page_num} 건너뜀")
+
+                    # 페이지 구분자 추가
+                    if out and page_num < total_pages:
+                        out.write("\n\n---\n\n")
+
+                    # 진행 상황 저장 (페이지마다)
+                    if out:
+                        out.flush()
+                        if fsync:
+                            os.fsync(out.fileno())
+                        progress.output_offset = out.buffer.tell()
+                    progress.last_update = datetime.now()
+                    progress.save(progress_file)
+            finally:
+                # 실행 중인 페이지가 끝난 뒤에 임시 디렉토리를 정리하도록 대기
+                executor.shutdown(wait=True, cancel_futures=True)
+        else:
+            # OCR하는 동안 다음 페이지를 미리 변환
+            rendered = iter_rendered_pages(
+                pdf_path,
+                [p for p in pages_to_process if p not in progress.completed_pages],
+                Path(page_dir.name),
+                dpi,
+                max_edge,
+                jpeg_quality,
+                skip_blank
+            )
+            for page_num in pages_to_process:
+                # 이미 완료된 페이지는 건너뛰기
+                if page_num in progress.completed_pages:
+                    if not quiet:
+                        print(f"\n페이지 {page_num} 이미 완료됨 (건너뜀)")
+                    success_count += 1
+                    continue
 
-                if extracted_text:
+                if not quiet:
+                    print(f"\n📖 페이지 {page_num}/{total_pages} 처리 중...")
+                    if stream:
+                        print("-" * 40)
+
+                # 미리 변환된 페이지 (변환 실패 시 None이면 아래에서 다시 시도, 빈 페이지는 변환하지 않음)
+                _, page_path, blank = next(rendered)
+                page_dpi = dpi
+                retry_count = 0
+                page_success = False
+                header_written = False
+
+                # 빈 페이지는 OCR 요청 없이 표시만 남김
+                if blank:
+                    if out:
+                        out.write(f"## 페이지 {page_num}\n\n{BLANK_PAGE_TEXT}")
                     progress.completed_pages.add(page_num)
                     page_success = True
                     success_count += 1
                     if not quiet:
-                        print(f"\n페이지 {page_num} 완료")
-
-            except APIError as e:
-                error_msg = str(e)
-                retry_count += 1
-                if not quiet:
-                    print(f"\nAPI 오류: {error_msg}")
-
-                if retry_count >= max_retries:
-                    progress.failed_pages[page_num] = error_msg
-                    if skip_errors:
-                        progress.skipped_pages.add(page_num)
-                        if output_path:
-                            with open(output_path, "a", encoding="utf-8") as f:
-                                f.write(f"*[API 오류: {error_msg}]*\n")
+                        print(f"⬜ 페이지 {page_num} 빈 페이지 (OCR 건너뜀)")
+
+                while retry_count < max_retries and not page_success:
+                    try:
+                        if retry_count > 0 and not quiet:
+                            print(f"🔄 페이지 {page_num} 재시도 ({retry_count}/{max_retries})")
+
+                        # 페이지를 JPEG으로 변환한 뒤 base64로 인코딩
+                        if page_path is None:
+                            page_path = render_pdf_page(
+                                pdf_path, page_num, Path(page_dir.name), page_dpi, max_edge, jpeg_quality
+                            )
+                        image_base64 = image_to_base64(page_path)
+
+                        # 페이지 헤더 추가 (변환에 실패한 첫 시도 이후 재시도에서도 한 번만)
+                        if out and not header_written:
+                            out.write(f"## 페이지 {page_num}\n\n")
+                            header_written = True
+
+                        # OCR 수행
+                        extracted_text = perform_ocr(
+                            image_base64,
+                            PDF_PAGE_PROMPT.format(page_num=page_num),
+                            file_handle=out,
+                            stream=stream,
+                            save_mode=save_mode,
+                            quiet=quiet,
+                            show_stats=False,  # 페이지별 통계는 표시하지 않음
+                            page_timeout=page_timeout,
+                            max_page_tokens=max_page_tokens,
+                            fsync=fsync
+                        )
+
+                        if extracted_text:
+                            progress.completed_pages.add(page_num)
+                            page_success = True
+                            success_count += 1
+                            if not quiet:
+                                print(f"\n페이지 {page_num} 완료")
+
+                    except APIError as e:
+                        error_msg = str(e)
+                        retry_count += 1
                         if not quiet:
-                            print(f"⏭️ 페이지 {page_num} 건너뜀")
-                        break
-                    else:
+                            print(f"\nAPI 오류: {error_msg}")
+
+                        if retry_count >= max_retries:
+                            progress.failed_pages[page_num] = error_msg
+                            if skip_errors:
+                                progress.skipped_pages.add(page_num)
+                                if out:
+                                    out.write(f"*[API 오류: {error_msg}]*\n")
+                                if not quiet:
+                                    print(f"⏭️ 페이지 {page_num} 건너뜀")
+                                break
+                            else:
+                                if not quiet:
+                                    print(f"\n페이지 {page_num} 최대 재시도 횟수 초과")
+                                progress.save(progress_file)
+                                return False
+
+                    except (RepetitionError, PageTimeoutError, TokenLimitError) as e:
+                        error_msg = str(e)
                         if not quiet:
-                            print(f"\n페이지 {page_num} 최대 재시도 횟수 초과")
-                        progress.save(progress_file)
-                        return
-
-            except (RepetitionError, PageTimeoutError, TokenLimitError) as e:
-                error_msg = str(e)
-                if not quiet:
-                    print(f"\n⚠️ 페이지 {page_num}: {error_msg}")
-
-                if skip_errors:
-                    progress.skipped_pages.add(page_num)
-                    progress.failed_pages[page_num] = error_msg
-                    if output_path:
-                        with open(output_path, "a", encoding="utf-8") as f:
-                            f.write(f"*[{error_msg}]*\n")
-                    if not quiet:
-                        print(f"⏭️ 페이지 {page_num} 건너뜀")
-                    break
-                else:
-                    retry_count += 1
-                    if retry_count >= max_retries:
+                            print(f"\n⚠️ 페이지 {page_num}: {error_msg}")
+
+                        if skip_errors:
+                            progress.skipped_pages.add(page_num)
+                            progress.failed_pages[page_num] = error_msg
+                            if out:
+                                out.write(f"*[{error_msg}]*\n")
+                            if not quiet:
+                                print(f"⏭️ 페이지 {page_num} 건너뜀")
+                            break
+                        else:
+                            retry_count += 1
+                            if retry_count >= max_retries:
+                                progress.failed_pages[page_num] = error_msg
+                                if not quiet:
+                                    print(f"\n페이지 {page_num} 최대 재시도 횟수 초과")
+                                # skip_errors가 False면 여기서 전체 중단
+                                progress.save(progress_file)
+                                return False
+
+                            # 해상도가 부족해 반복/과다 생성된 경우 더 높은 DPI로 다시 변환
+                            if max_edge is None and not isinstance(e, PageTimeoutError) and page_dpi < PDF_RETRY_DPI:
+                                page_dpi = PDF_RETRY_DPI
+                                if page_path:
+                                    page_path.unlink(missing_ok=True)
+                                page_path = None
+                                if not quiet:
+                                    print(f"🔍 {page_dpi} DPI로 다시 변환합니다")
+
+                    except Exception as e:
+                        error_msg = str(e)
+                        print(f"\n페이지 {page_num} 처리 중 예상치 못한 오류: {e}")
+                        retry_count += 1
                         progress.failed_pages[page_num] = error_msg
-                        if not quiet:
-                            print(f"\n페이지 {page_num} 최대 재시도 횟수 초과")
-                        # skip_errors가 False면 여기서 전체 중단
-                        progress.save(progress_file)
-                        return
-
-            except Exception as e:
-                error_msg = str(e)
-                print(f"\n페이지 {page_num} 처리 중 예상치 못한 오류: {e}")
-                retry_count += 1
-                progress.failed_pages[page_num] = error_msg
-                if retry_count >= max_retries:
-                    if output_path:
-                        with open(output_path, "a", encoding="utf-8") as f:
-                            f.write(f"*[처리 오류: {error_msg}]*\n")
-                    if skip_errors:
-                        progress.skipped_pages.add(page_num)
-                        break
-                    else:
-                        progress.save(progress_file)
-                        return
-
-        # 페이지 구분자 추가
-        if output_path and page_num < len(images):
-            with open(output_path, "a", encoding="utf-8") as f:
-                f.write("\n\n---\n\n")
-
-        # 진행 상황 저장 (페이지마다)
-        progress.last_update = datetime.now()
-        progress.save(progress_file)
-
-    total_elapsed = time.time() - total_start_time
-
-    # 마지막에 처리 시간 추가
-    if output_path:
-        with open(output_path, "a", encoding="utf-8") as f:
-            f.write(f"\n---\n\n**전체 처리 시간**: {total_elapsed:.2f}초\n")
+                        if retry_count >= max_retries:
+                            if out:
+                                out.write(f"*[처리 오류: {error_msg}]*\n")
+                            if skip_errors:
+                                progress.skipped_pages.add(page_num)
+                                break
+                            else:
+                                progress.save(progress_file)
+                                return False
+
+                # 변환한 페이지 이미지 정리
+                if page_path:
+                    page_path.unlink(missing_ok=True)
+
+                # 페이지 구분자 추가
+                if out and page_num < total_pages:
+                    out.write("\n\n---\n\n")
+
+                # 진행 상황 저장 (페이지마다)
+                if out:
+                    out.flush()
+                    progress.output_offset = out.buffer.tell()
+                progress.last_update = datetime.now()
+                progress.save(progress_file)
+
+        total_elapsed = time.time() - total_start_time
+
+        # 마지막에 처리 시간 추가
+        if out:
+            out.write(f"\n---\n\n**전체 처리 시간**: {total_elapsed:.2f}초\n")
+    finally:
+        if out:
+            out.close()
+        if rendered:
+            rendered.close()
+        page_dir.cleanup()
 
     # 완료 시 진행 상황 파일 처리
     if progress.is_complete():
@@ -884,7 +1453,7 @@ def process_pdf_file(
 
     if not quiet:
         print(f"\n전체 PDF 처리 완료 ({total_elapsed:.2f}초)")
-        print(f"   성공: {success_count}/{len(images)} 페이지")
+        print(f"   성공: {success_count}/{total_pages} 페이지")
         if len(progress.skipped_pages) > 0:
             print(f"   건너뜀: {len(progress.skipped_pages)} 페이지")
         if len(progress.failed_pages) > 0:
@@ -894,9 +1463,121 @@ def process_pdf_file(
 
     if show_stats:
         print(f"\n📊 처리 통계:")
-        print(f"   총 페이지: {len(images)}")
+        print(f"   총 페이지: {total_pages}")
         print(f"   성공한 페이지: {success_count}")
-        print(f"   평균 페이지 처리 시간: {total_elapsed/len(images):.2f}초")
+        print(f"   평균 페이지 처리 시간: {total_elapsed/total_pages:.2f}초")
+
+    # --start-page로 일부만 처리한 경우에도 요청한 페이지 기준으로 성공 여부 판단
+    done_pages = progress.completed_pages | progress.skipped_pages
+    return all(p in done_pages for p in pages_to_process)
+
+
+def is_supported_file(file_path: Path) -> bool:
+    """PDF 또는 지원하는 이미지 파일인지 확인합니다."""
+    suffix = file_path.suffix.lower()
+    return suffix == ".pdf" or suffix in IMAGE_EXTENSIONS
+
+
+def process_file(
+    file_path: Path,
+    args: argparse.Namespace,
+    save_mode: SaveMode,
+    quiet: bool,
+    keep_suffix: bool = False
+) -> bool:
+    """확장자에 따라 PDF 또는 이미지 처리를 실행하고 성공 여부를 반환합니다."""
+    if file_path.suffix.lower() == ".pdf":
+        return process_pdf_file(
+            file_path,
+            stream=not args.no_stream,
+            save_mode=save_mode,
+            quiet=quiet,
+            show_stats=args.stats,
+            no_save=args.no_save,
+            resume=args.resume,
+            start_page=args.start_page,
+            skip_errors=args.skip_errors,
+            max_retries=args.max_retries,
+            page_timeout=args.page_timeout,
+            max_page_tokens=args.max_page_tokens,
+            concurrency=args.concurrency,
+            fsync=args.fsync,
+            dpi=args.dpi,
+            max_edge=args.max_image_edge,
+            jpeg_quality=args.jpeg_quality,
+            skip_blank=args.skip_blank_pages,
+            keep_suffix=keep_suffix
+        )
+    return process_image_file(
+        file_path,
+        stream=not args.no_stream,
+        save_mode=save_mode,
+        quiet=quiet,
+        show_stats=args.stats,
+        no_save=args.no_save,
+        fsync=args.fsync,
+        keep_suffix=keep_suffix
+    )
+
+
+def process_batch_dir(batch_dir: Path, args: argparse.Namespace, save_mode: SaveMode):
+    """디렉토리 안의 PDF와 이미지 파일을 이름 순서대로 처리합니다.
+
+    concurrency가 2 이상이면 이미지 파일들을 화면 출력 없이 동시에 요청하고,
+    PDF는 파일마다 페이지 단위로 동시 처리합니다.
+    확장자만 다른 파일(scan.png, scan.pdf 등)은 결과 파일 이름에 확장자를 남겨 겹치지 않게 합니다.
+    """
+    if not batch_dir.is_dir():
+        print(f"디렉토리를 찾을 수 없습니다: {batch_dir}")
+        sys.exit(1)
+
+    files = sorted(p for p in batch_dir.iterdir() if p.is_file() and is_supported_file(p))
+    total = len(files)
+    images = [p for p in files if p.suffix.lower() != ".pdf"]
+    print(f"\n📁 일괄 처리: {batch_dir} (PDF {len(files) - len(images)}개, 이미지 {len(images)}개)")
+
+    # 대소문자를 구분하지 않는 파일 시스템도 고려하여 이름(확장자 제외) 중복 확인
+    stem_counts = Counter(p.stem.lower() for p in files)
+    colliding = {p for p in files if stem_counts[p.stem.lower()] > 1}
+    if colliding and not args.quiet:
+        print(f"📝 이름이 겹치는 파일 {len(colliding)}개는 결과 파일 이름에 확장자를 포함합니다 (예: name.png.md)")
+
+    failed: list[Path] = []
+
+    if args.concurrency > 1 and len(images) > 1:
+        print(f"\n⚡ 이미지 {len(images)}개를 최대 {args.concurrency}개씩 동시 처리합니다")
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            futures = {
+                p: executor.submit(process_file, p, args, save_mode, True, p in colliding)
+                for p in images
+            }
+            for image_path, future in futures.items():
+                try:
+                    success = future.result()
+                    error_msg = "텍스트 추출 실패 또는 중단"
+                except Exception as e:
+                    success = False
+                    error_msg = str(e)
+                if success:
+                    if not args.quiet:
+                        print(f"✅ {image_path.name}")
+                else:
+                    failed.append(image_path)
+                    print(f"⚠️ {image_path.name} 처리 실패: {error_msg}")
+        files = [p for p in files if p.suffix.lower() == ".pdf"]
+
+    for file_path in files:
+        try:
+            success = process_file(file_path, args, save_mode, args.quiet, file_path in colliding)
+        except Exception as e:
+            success = False
+            print(f"\n⚠️ {file_path.name} 처리 실패: {e}")
+        if not success:
+            failed.append(file_path)
+
+    print(f"\n📁 일괄 처리 결과: 성공 {total - len(failed)}개, 실패 {len(failed)}개")
+    for file_path in failed:
+        print(f"   ❌ {file_path.name}")
 
 
 def main():
@@ -927,6 +1608,9 @@ def main():
 
   파일 저장 안 함:
     python ocr.py --no-save image.png
+
+  디렉토리 일괄 처리:
+    python ocr.py --batch-dir scans/ --concurrency 4
         """
     )
 
@@ -950,6 +1634,9 @@ def main():
     parser.add_argument('--no-save', action='store_true',
                        help='파일로 저장하지 않음')
 
+    parser.add_argument('--fsync', action='store_true',
+                       help=f'결과 파일을 디스크에 동기화 (fsync, 스트리밍 중 최대 {FSYNC_INTERVAL:g}초마다 + 요청 종료 시)')
+
     parser.add_argument('--server', type=str, default=SERVER_URL,
                        help=f'서버 URL (기본: {SERVER_URL})')
 
@@ -972,6 +1659,24 @@ def main():
     parser.add_argument('--max-page-tokens', type=int, default=8000, metavar='N',
                        help='페이지당 최대 토큰 수 (기본: 8000)')
 
+    parser.add_argument('--concurrency', type=int, default=1, metavar='N',
+                       help='PDF 페이지 동시 처리 수 (2 이상이면 실시간 출력 없이 병렬 처리, 기본: 1)')
+
+    parser.add_argument('--dpi', type=int, default=PDF_DPI, metavar='N',
+                       help=f'PDF 페이지 변환 DPI (반복/토큰 초과 재시도 시 {PDF_RETRY_DPI}로 상향, 기본: {PDF_DPI})')
+
+    parser.add_argument('--max-image-edge', type=int, metavar='PIXELS',
+                       help='PDF 페이지 이미지의 긴 변 픽셀 수 (지정 시 DPI 대신 사용)')
+
+    parser.add_argument('--jpeg-quality', type=int, default=PDF_JPEG_QUALITY, metavar='N',
+                       help=f'PDF 페이지를 JPEG으로 변환할 때 품질 1-100 (기본: {PDF_JPEG_QUALITY})')
+
+    parser.add_argument('--skip-blank-pages', action='store_true',
+                       help='빈 PDF 페이지는 OCR 요청 없이 건너뛰기')
+
+    parser.add_argument('--batch-dir', type=str, metavar='DIR',
+                       help='디렉토리 안의 PDF/이미지 파일을 모두 처리 (--concurrency로 이미지 동시 처리)')
+
     # 설정 파일 관련 인자
     parser.add_argument('-c', '--config', type=str, metavar='FILE',
                        help='YAML 설정 파일 경로')
@@ -1020,7 +1725,9 @@ def main():
         sys.exit(1)
 
     # 파일 경로 확인
-    if not args.file:
+    if args.batch_dir:
+        file_path = None
+    elif not args.file:
         # 기본 테스트 파일 찾기
         test_files = [
             Path("data/test.pdf"),
@@ -1055,30 +1762,10 @@ def main():
         print(f"   통계 표시: {'활성화' if args.stats else '비활성화'}")
 
     # 파일 처리
-    if file_path.suffix.lower() == ".pdf":
-        process_pdf_file(
-            file_path,
-            stream=not args.no_stream,
-            save_mode=save_mode,
-            quiet=args.quiet,
-            show_stats=args.stats,
-            no_save=args.no_save,
-            resume=args.resume,
-            start_page=args.start_page,
-            skip_errors=args.skip_errors,
-            max_retries=args.max_retries,
-            page_timeout=args.page_timeout,
-            max_page_tokens=args.max_page_tokens
-        )
-    elif file_path.suffix.lower() in [".png", ".jpg", ".jpeg", ".bmp", ".gif", ".tiff"]:
-        process_image_file(
-            file_path,
-            stream=not args.no_stream,
-            save_mode=save_mode,
-            quiet=args.quiet,
-            show_stats=args.stats,
-            no_save=args.no_save
-        )
+    if args.batch_dir:
+        process_batch_dir(Path(args.batch_dir), args, save_mode)
+    elif is_supported_file(file_path):
+        process_file(file_path, args, save_mode, args.quiet)
     else:
         print(f"지원하지 않는 파일 형식: {file_path.suffix}")
         print("   지원 형식: PDF, PNG, JPG, JPEG, BMP, GIF, TIFF")